@@ -7,19 +7,23 @@ This script prints NDJSON to stdout so you can pipe into curl:
     | curl -sS -X POST -H 'Content-Type: application/x-ndjson' --data-binary @- \
       http://localhost:7001/ingest/meter_usage/ndjson
 
-It uses only the Python standard library.
+It uses only the Python standard library. Lines are rendered from pre-built
+templates straight to bytes rather than going through a JSON encoder per row.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from itertools import islice, repeat
+from math import isfinite
 from typing import Iterator
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TimeSpec:
     start: datetime
     step: timedelta
@@ -29,25 +33,78 @@ def _parse_rfc3339_z(s: str) -> datetime:
     # Accept forms like: 2024-01-01T00:00:00Z
     if not s.endswith("Z"):
         raise ValueError("timestamp must end with 'Z'")
+    try:
+        # fromisoformat parses the Z suffix itself (as UTC), in C.
+        return datetime.fromisoformat(s)
+    except ValueError:
+        # e.g. a bare date or an offset followed by Z; retry without the Z.
+        pass
     base = s.removesuffix("Z")
     dt = datetime.fromisoformat(base)
     return dt.replace(tzinfo=timezone.utc)
 
 
 def _format_rfc3339_z(dt: datetime) -> str:
-    dt = dt.astimezone(timezone.utc)
-    # Keep seconds precision; append Z.
-    return dt.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    # `dt` is naive UTC (see _times); keep seconds precision and append Z.
+    return dt.isoformat(timespec="seconds") + "Z"
 
 
 def _times(spec: TimeSpec, count: int) -> Iterator[datetime]:
-    t = spec.start
+    # Normalize to naive UTC once, so per-row formatting needs no tz handling.
+    t = spec.start.astimezone(timezone.utc).replace(tzinfo=None)
+    step = spec.step
     for _ in range(count):
         yield t
-        t = t + spec.step
+        t += step
 
 
-def meter_usage_records(
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SECOND = timedelta(seconds=1)
+
+
+def _timestamps(spec: TimeSpec, count: int) -> Iterator[str]:
+    # Whole-second steps take the integer fast path; finer steps format datetimes.
+    step, remainder = divmod(spec.step, _SECOND)
+    if remainder:
+        return map(_format_rfc3339_z, _times(spec, count))
+    start = (spec.start.astimezone(timezone.utc) - _EPOCH) // _SECOND
+    return _whole_second_timestamps(start, step, count)
+
+
+def _whole_second_timestamps(start: int, step: int, count: int) -> Iterator[str]:
+    # Integer epoch seconds, caching the date prefix per day and the clock per second-of-day.
+    day: int | None = None
+    prefix = ""
+    clock: dict[int, str] = {}
+    for i in range(count):
+        days, secs = divmod(start + i * step, 86400)
+        if days != day:
+            day = days
+            prefix = (_EPOCH.date() + timedelta(days=days)).isoformat() + "T"
+        hms = clock.get(secs)
+        if hms is None:
+            hours, rest = divmod(secs, 3600)
+            minutes, seconds = divmod(rest, 60)
+            hms = clock[secs] = f"{hours:02d}:{minutes:02d}:{seconds:02d}Z"
+        yield prefix + hms
+
+
+def _number(v: float) -> str:
+    # Non-finite values keep json.dumps's NaN/Infinity spelling.
+    return f"{v:.6f}" if isfinite(v) else json.dumps(v)
+
+
+def _series(base: float, step: float, count: int) -> Iterator[str]:
+    # base + i * step, fixed six decimals; huge magnitudes print in full (1e308: 309 digits).
+    if step == 0:
+        return repeat(_number(base), count)
+    # Linear, so finite endpoints mean every value is finite.
+    if isfinite(base) and isfinite(step) and isfinite(base + (count - 1) * step):
+        return (f"{base + i * step:.6f}" for i in range(count))
+    return (_number(base + i * step) for i in range(count))
+
+
+def meter_usage_lines(
     *,
     meter_id: str,
     count: int,
@@ -55,17 +112,15 @@ def meter_usage_records(
     kwh_base: float,
     kwh_step: float,
     premise_id: str | None,
-) -> Iterator[dict[str, object]]:
-    for i, ts in enumerate(_times(times, count)):
-        yield {
-            "ts": _format_rfc3339_z(ts),
-            "meter_id": meter_id,
-            "premise_id": premise_id,
-            "kwh": round(kwh_base + i * kwh_step, 6),
-        }
+) -> Iterator[bytes]:
+    """Yield meter_usage payloads as encoded NDJSON lines."""
+    # Constant fields are JSON-escaped once; only ts and kwh vary per row.
+    fields = f'"meter_id":{json.dumps(meter_id)},"premise_id":{json.dumps(premise_id)}'
+    for ts, kwh in zip(_timestamps(times, count), _series(kwh_base, kwh_step, count)):
+        yield f'{{"ts":"{ts}",{fields},"kwh":{kwh}}}\n'.encode()
 
 
-def generation_output_records(
+def generation_output_lines(
     *,
     plant_id: str,
     unit_id: str | None,
@@ -73,22 +128,23 @@ def generation_output_records(
     times: TimeSpec,
     mw_base: float,
     mw_step: float,
-) -> Iterator[dict[str, object]]:
-    for i, ts in enumerate(_times(times, count)):
-        payload: dict[str, object] = {
-            "ts": _format_rfc3339_z(ts),
-            "plant_id": plant_id,
-            "mw": round(mw_base + i * mw_step, 6),
-        }
-        if unit_id is not None:
-            payload["unit_id"] = unit_id
-        yield payload
+) -> Iterator[bytes]:
+    """Yield generation_output payloads as encoded NDJSON lines."""
+    plant = json.dumps(plant_id)
+    unit = "" if unit_id is None else f',"unit_id":{json.dumps(unit_id)}'
+    for ts, mw in zip(_timestamps(times, count), _series(mw_base, mw_step, count)):
+        yield f'{{"ts":"{ts}","plant_id":{plant},"mw":{mw}{unit}}}\n'.encode()
+
+
+_WRITE_BATCH = 4096
 
 
-def _write_ndjson(records: Iterator[dict[str, object]]) -> None:
-    # Print compact JSON lines.
-    for rec in records:
-        print(json.dumps(rec, separators=(",", ":")))
+def _write_ndjson(lines: Iterator[bytes]) -> None:
+    # Write lines to stdout in joined batches, one write per batch.
+    buf = sys.stdout.buffer
+    while chunk := b"".join(islice(lines, _WRITE_BATCH)):
+        buf.write(chunk)
+    buf.flush()
 
 
 def main() -> int:
@@ -130,7 +186,7 @@ def main() -> int:
     times = TimeSpec(start=start, step=timedelta(seconds=int(args.step_seconds)))
 
     if args.cmd == "meter-usage":
-        records = meter_usage_records(
+        lines = meter_usage_lines(
             meter_id=str(args.meter_id),
             premise_id=(str(args.premise_id) if args.premise_id is not None else None),
             count=int(args.count),
@@ -138,11 +194,11 @@ def main() -> int:
             kwh_base=float(args.kwh_base),
             kwh_step=float(args.kwh_step),
         )
-        _write_ndjson(records)
+        _write_ndjson(lines)
         return 0
 
     if args.cmd == "generation-output":
-        records = generation_output_records(
+        lines = generation_output_lines(
             plant_id=str(args.plant_id),
             unit_id=(str(args.unit_id) if args.unit_id is not None else None),
             count=int(args.count),
@@ -150,7 +206,7 @@ def main() -> int:
             mw_base=float(args.mw_base),
             mw_step=float(args.mw_step),
         )
-        _write_ndjson(records)
+        _write_ndjson(lines)
         return 0
 
     raise AssertionError("unreachable")
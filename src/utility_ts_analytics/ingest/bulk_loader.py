@@ -7,35 +7,46 @@ possible.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Iterable, Mapping
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CopyJob:
     """Description of a QuestDB COPY job from a CSV file.
 
     This is intentionally declarative and immutable so that you can compose
     and test job definitions without touching QuestDB.
+
+    ``extra_options`` is a tuple of ``(name, value)`` pairs, e.g.
+    ``(("timestamp", "ts"),)``.
     """
 
     table: str
     csv_path: Path
     has_header: bool = True
-    extra_options: Mapping[str, str] | None = None
+    # (name, value) pairs rather than a mapping so that jobs stay hashable.
+    extra_options: tuple[tuple[str, str], ...] | None = None
+
+    def __post_init__(self) -> None:
+        if isinstance(self.extra_options, Mapping):
+            raise TypeError(
+                "CopyJob.extra_options must be a tuple of (name, value) pairs, "
+                "e.g. tuple(options.items()), not a mapping"
+            )
 
 
 def build_copy_sql(job: CopyJob) -> str:
     """Build the SQL COPY statement for a given job.
 
-    This function is pure and easy to test.
+    This function is pure and easy to test. The ``WITH`` clause is memoized
+    per unique ``(has_header, extra_options)``, so jobs that share options
+    (e.g. one transform mapped over many files) only format the table and
+    path.
     """
 
-    options: dict[str, str] = {"header": "true" if job.has_header else "false"}
-    if job.extra_options:
-        options.update(job.extra_options)
-
-    opts_sql = ", ".join(f"{k} {v}" for k, v in options.items())
+    opts_sql = _options_sql(job.has_header, job.extra_options)
 
     # QuestDB requires a server-side path.
     return (
@@ -45,11 +56,25 @@ def build_copy_sql(job: CopyJob) -> str:
     )
 
 
-def map_jobs(transform: Callable[[CopyJob], CopyJob], jobs: Iterable[CopyJob]) -> list[CopyJob]:
+@lru_cache(maxsize=1024)
+def _options_sql(has_header: bool, extra_options: tuple[tuple[str, str], ...] | None) -> str:
+    options: dict[str, str] = {"header": "true" if has_header else "false"}
+    if extra_options:
+        options.update(extra_options)
+
+    return ", ".join(f"{k} {v}" for k, v in options.items())
+
+
+def map_jobs(
+    transform: Callable[[CopyJob], CopyJob | None], jobs: Iterable[CopyJob]
+) -> list[CopyJob]:
     """Apply a transformation function to a collection of jobs.
 
     This is a small helper to encourage functional composition over
-    in-place mutation.
+    in-place mutation. Transforms that change a single field are best written
+    with ``dataclasses.replace`` (e.g. ``replace(job, has_header=False)``).
+    A transform may return ``None`` to drop a job, so filtering and mapping
+    happen in one pass.
     """
 
-    return [transform(job) for job in jobs]
+    return [j for j in map(transform, jobs) if j is not None]
@@ -1,7 +1,10 @@
 """Helpers to build common QuestDB SQL for meter usage analysis.
 
-These functions are deliberately pure: they just return SQL strings based on
-parameters, leaving execution to the caller.
+These functions are deliberately pure: they return a ``(sql, params)`` pair,
+leaving execution to the caller (e.g. ``cursor.execute(sql, params)`` with
+psycopg). Values are bound via ``%s`` placeholders rather than inlined, so the
+SQL text is constant per query shape and QuestDB can reuse its cached plan
+across calls.
 """
 from __future__ import annotations
 
@@ -9,20 +12,13 @@ from dataclasses import dataclass
 from typing import Iterable
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TimeRange:
     start: str  # ISO-8601 timestamp string
     end: str
 
 
-def load_profile_sql(meter_id: str, time_range: TimeRange) -> str:
-    """SQL to fetch a time-ordered load profile for a single meter.
-
-    This applies the meter_scale_map.kwh_multiplier (CT/PT or billing multiplier)
-    so the returned kWh reflect actual usage, not raw register values.
-    """
-
-    return f"""
+_LOAD_PROFILE_SQL = """
 SELECT
     mu.ts,
     mu.kwh * COALESCE(msm.kwh_multiplier, 1.0) AS kwh
@@ -31,23 +27,37 @@ LEFT JOIN meter_scale_map msm
   ON msm.meter_id = mu.meter_id
  AND msm.from_ts <= mu.ts
  AND msm.to_ts   >  mu.ts
-WHERE mu.meter_id = '{meter_id}'
-  AND mu.ts >= '{time_range.start}'
-  AND mu.ts <  '{time_range.end}'
+WHERE mu.meter_id = %s
+  AND mu.ts >= %s
+  AND mu.ts <  %s
 ORDER BY mu.ts;
 """.strip()
 
 
+def load_profile_sql(meter_id: str, time_range: TimeRange) -> tuple[str, tuple[str, str, str]]:
+    """SQL and bind parameters to fetch a time-ordered load profile for a single meter.
+
+    This applies the meter_scale_map.kwh_multiplier (CT/PT or billing multiplier)
+    so the returned kWh reflect actual usage, not raw register values.
+    """
+
+    return _LOAD_PROFILE_SQL, (meter_id, time_range.start, time_range.end)
+
+
 def aggregated_segment_load_sql(
     segments: Iterable[str],
     time_range: TimeRange,
     sample_by: str = "1h",
-) -> str:
-    """SQL to aggregate kWh by customer segment over time."""
+) -> tuple[str, tuple[str, str, list[str]]]:
+    """SQL and bind parameters to aggregate kWh by customer segment over time.
 
-    segments_list = ", ".join(f"'{s}'" for s in segments)
+    Segments are bound as a single array (``c.segment = ANY(%s)``, as in the
+    Rust client), so the SQL does not depend on how many are passed.
+    ``sample_by`` is a SQL keyword argument rather than a value, so it is
+    inlined; callers must not pass untrusted input for it.
+    """
 
-    return f"""
+    sql = f"""
 SELECT
     mu.ts,
     c.segment,
@@ -59,10 +69,12 @@ LEFT JOIN meter_scale_map msm
   ON msm.meter_id = mu.meter_id
  AND msm.from_ts <= mu.ts
  AND msm.to_ts   >  mu.ts
-WHERE mu.ts >= '{time_range.start}'
-  AND mu.ts <  '{time_range.end}'
-  AND c.segment IN ({segments_list})
+WHERE mu.ts >= %s
+  AND mu.ts <  %s
+  AND c.segment = ANY(%s)
 SAMPLE BY {sample_by} ALIGN TO CALENDAR
 GROUP BY segment, ts
 ORDER BY ts, segment;
 """.strip()
+
+    return sql, (time_range.start, time_range.end, list(segments))
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 
+import pytest
+
 from utility_ts_analytics.ingest.bulk_loader import CopyJob, build_copy_sql, map_jobs
 
 
@@ -20,7 +23,7 @@ def test_build_copy_sql_can_merge_extra_options() -> None:
     job = CopyJob(
         table="meter_usage",
         csv_path=Path("/var/lib/questdb/import/meter_usage.csv"),
-        extra_options={"timestamp": "ts"},
+        extra_options=(("timestamp", "ts"),),
     )
 
     sql = build_copy_sql(job)
@@ -28,6 +31,37 @@ def test_build_copy_sql_can_merge_extra_options() -> None:
     assert "timestamp ts" in sql
 
 
+def test_build_copy_sql_extra_options_override_header() -> None:
+    job = CopyJob(
+        table="meter_usage",
+        csv_path=Path("/var/lib/questdb/import/meter_usage.csv"),
+        extra_options=(("header", "false"),),
+    )
+
+    sql = build_copy_sql(job)
+
+    assert "header false" in sql
+    assert "header true" not in sql
+
+
+def test_copy_job_rejects_mapping_extra_options() -> None:
+    with pytest.raises(TypeError, match="tuple of \\(name, value\\) pairs"):
+        CopyJob(
+            table="meter_usage",
+            csv_path=Path("/a.csv"),
+            extra_options={"timestamp": "ts"},  # type: ignore[arg-type]
+        )
+
+
+def test_build_copy_sql_keeps_path_per_job_with_shared_options() -> None:
+    opts = (("timestamp", "ts"),)
+    a = build_copy_sql(CopyJob(table="meter_usage", csv_path=Path("/a.csv"), extra_options=opts))
+    b = build_copy_sql(CopyJob(table="meter_usage", csv_path=Path("/b.csv"), extra_options=opts))
+
+    assert a == "COPY meter_usage FROM '/a.csv' WITH header true, timestamp ts;"
+    assert b == "COPY meter_usage FROM '/b.csv' WITH header true, timestamp ts;"
+
+
 def test_map_jobs_is_pure_and_composable() -> None:
     jobs = [
         CopyJob(table="meter_usage", csv_path=Path("/a.csv")),
@@ -35,10 +69,24 @@ def test_map_jobs_is_pure_and_composable() -> None:
     ]
 
     def with_no_header(j: CopyJob) -> CopyJob:
-        return CopyJob(table=j.table, csv_path=j.csv_path, has_header=False, extra_options=j.extra_options)
+        return replace(j, has_header=False)
 
     out = map_jobs(with_no_header, jobs)
 
     assert [j.has_header for j in out] == [False, False]
     # original unchanged
     assert [j.has_header for j in jobs] == [True, True]
+
+
+def test_map_jobs_drops_jobs_mapped_to_none() -> None:
+    jobs = [
+        CopyJob(table="meter_usage", csv_path=Path("/a.csv")),
+        CopyJob(table="generation_output", csv_path=Path("/b.csv")),
+    ]
+
+    def only_meter_usage(j: CopyJob) -> CopyJob | None:
+        return j if j.table == "meter_usage" else None
+
+    out = map_jobs(only_meter_usage, jobs)
+
+    assert [j.table for j in out] == ["meter_usage"]
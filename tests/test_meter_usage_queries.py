@@ -9,19 +9,49 @@ from utility_ts_analytics.queries.meter_usage_queries import (
 
 def test_load_profile_sql_includes_scale_join_and_time_bounds() -> None:
     tr = TimeRange(start="2024-01-01T00:00:00Z", end="2024-01-02T00:00:00Z")
-    sql = load_profile_sql(meter_id="m-1", time_range=tr)
+    sql, params = load_profile_sql(meter_id="m-1", time_range=tr)
 
     assert "FROM meter_usage mu" in sql
     assert "LEFT JOIN meter_scale_map" in sql
-    assert "mu.meter_id = 'm-1'" in sql
-    assert "mu.ts >= '2024-01-01T00:00:00Z'" in sql
-    assert "mu.ts <  '2024-01-02T00:00:00Z'" in sql
+    assert "mu.meter_id = %s" in sql
+    assert "mu.ts >= %s" in sql
+    assert "mu.ts <  %s" in sql
+    assert params == ("m-1", "2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z")
+
+
+def test_load_profile_sql_does_not_inline_values() -> None:
+    tr = TimeRange(start="2024-01-01T00:00:00Z", end="2024-01-02T00:00:00Z")
+    sql_a, _ = load_profile_sql(meter_id="m-1", time_range=tr)
+    sql_b, params = load_profile_sql(meter_id="m-1' OR '1'='1", time_range=tr)
+
+    assert sql_a == sql_b
+    assert params[0] == "m-1' OR '1'='1"
 
 
 def test_aggregated_segment_load_sql_includes_sample_by_and_segments() -> None:
     tr = TimeRange(start="2024-01-01T00:00:00Z", end="2024-01-02T00:00:00Z")
-    sql = aggregated_segment_load_sql(segments=["res", "c&i"], time_range=tr, sample_by="1h")
+    sql, params = aggregated_segment_load_sql(
+        segments=["res", "c&i"], time_range=tr, sample_by="1h"
+    )
 
     assert "SAMPLE BY 1h" in sql
-    assert "c.segment IN ('res', 'c&i')" in sql
+    assert "mu.ts >= %s" in sql
+    assert "c.segment = ANY(%s)" in sql
     assert "GROUP BY segment, ts" in sql
+    assert params == ("2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z", ["res", "c&i"])
+
+
+def test_aggregated_segment_load_sql_binds_segments_verbatim() -> None:
+    tr = TimeRange(start="2024-01-01T00:00:00Z", end="2024-01-02T00:00:00Z")
+    sql, params = aggregated_segment_load_sql(segments=["o'brien"], time_range=tr)
+
+    assert "o'brien" not in sql
+    assert params[2] == ["o'brien"]
+
+
+def test_aggregated_segment_load_sql_text_is_independent_of_segment_count() -> None:
+    tr = TimeRange(start="2024-01-01T00:00:00Z", end="2024-01-02T00:00:00Z")
+    sql_one, _ = aggregated_segment_load_sql(segments=["res"], time_range=tr)
+    sql_many, _ = aggregated_segment_load_sql(segments=["res", "c&i", "ag"], time_range=tr)
+
+    assert sql_one == sql_many
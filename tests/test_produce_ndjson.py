@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "produce_ndjson.py"
+_spec = importlib.util.spec_from_file_location("produce_ndjson", _SCRIPT)
+assert _spec is not None and _spec.loader is not None
+produce_ndjson = importlib.util.module_from_spec(_spec)
+# Registered before exec so @dataclass can resolve the module's annotations.
+sys.modules[_spec.name] = produce_ndjson
+_spec.loader.exec_module(produce_ndjson)
+
+
+def _utc(
+    year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0
+) -> datetime:
+    return datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    ("start", "step_seconds", "count"),
+    [
+        pytest.param(_utc(2024, 1, 1), 900, 500, id="default-15min"),
+        pytest.param(_utc(1969, 12, 31, 23, 0), 60, 200, id="start-before-1970"),
+        pytest.param(_utc(1901, 6, 1, 12, 34, 56), 86400 * 3 + 17, 200, id="long-before-1970"),
+        pytest.param(_utc(1970, 1, 1, 0, 30), -900, 200, id="negative-step-across-epoch"),
+        pytest.param(_utc(2024, 1, 1), 7, 2000, id="step-not-dividing-a-day"),
+        pytest.param(_utc(2024, 2, 28, 23, 0), 1800, 100, id="leap-day-rollover"),
+        pytest.param(_utc(2023, 2, 28, 23, 0), 1800, 100, id="non-leap-rollover"),
+        pytest.param(_utc(2023, 12, 31, 23, 59, 0), 1, 120, id="year-rollover"),
+        pytest.param(_utc(2024, 1, 1), 0, 5, id="zero-step"),
+        pytest.param(
+            _utc(2024, 1, 1, 23, 59, 59) + timedelta(microseconds=999_999),
+            1,
+            5,
+            id="microseconds-truncated",
+        ),
+        pytest.param(
+            _utc(1969, 12, 31, 23, 59, 59) + timedelta(microseconds=500_000),
+            -1,
+            5,
+            id="microseconds-before-1970",
+        ),
+    ],
+)
+def test_whole_second_timestamps_match_datetime_formatting(
+    start: datetime, step_seconds: int, count: int
+) -> None:
+    spec = produce_ndjson.TimeSpec(start=start, step=timedelta(seconds=step_seconds))
+
+    fast = list(produce_ndjson._timestamps(spec, count))
+    reference = list(map(produce_ndjson._format_rfc3339_z, produce_ndjson._times(spec, count)))
+
+    assert fast == reference
+
+
+def test_sub_second_step_uses_datetime_formatting() -> None:
+    spec = produce_ndjson.TimeSpec(start=_utc(2024, 1, 1), step=timedelta(milliseconds=1500))
+
+    assert list(produce_ndjson._timestamps(spec, 3)) == [
+        "2024-01-01T00:00:00Z",
+        "2024-01-01T00:00:01Z",
+        "2024-01-01T00:00:03Z",
+    ]
+
+
+def test_write_ndjson_writes_all_lines_to_stdout(
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    lines = [b'{"n":%d}\n' % i for i in range(produce_ndjson._WRITE_BATCH + 3)]
+
+    produce_ndjson._write_ndjson(iter(lines))
+
+    assert capsysbinary.readouterr().out == b"".join(lines)
+
+
+_SPEC = produce_ndjson.TimeSpec(
+    start=datetime(2024, 1, 1, tzinfo=timezone.utc), step=timedelta(seconds=900)
+)
+
+
+def _parse_lines(lines: list[bytes]) -> list[dict[str, object]]:
+    assert all(line.endswith(b"\n") and line.count(b"\n") == 1 for line in lines)
+    return [json.loads(line) for line in lines]
+
+
+@pytest.mark.parametrize("premise_id", [None, "p-1"])
+def test_meter_usage_lines_are_json_in_field_order(premise_id: str | None) -> None:
+    lines = list(
+        produce_ndjson.meter_usage_lines(
+            meter_id="m-1",
+            premise_id=premise_id,
+            count=2,
+            times=_SPEC,
+            kwh_base=1.0,
+            kwh_step=0.5,
+        )
+    )
+
+    recs = _parse_lines(lines)
+
+    assert [list(r) for r in recs] == [["ts", "meter_id", "premise_id", "kwh"]] * 2
+    assert recs == [
+        {"ts": "2024-01-01T00:00:00Z", "meter_id": "m-1", "premise_id": premise_id, "kwh": 1.0},
+        {"ts": "2024-01-01T00:15:00Z", "meter_id": "m-1", "premise_id": premise_id, "kwh": 1.5},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("unit_id", "keys"),
+    [
+        (None, ["ts", "plant_id", "mw"]),
+        ("u-1", ["ts", "plant_id", "mw", "unit_id"]),
+    ],
+)
+def test_generation_output_lines_are_json_in_field_order(
+    unit_id: str | None, keys: list[str]
+) -> None:
+    lines = list(
+        produce_ndjson.generation_output_lines(
+            plant_id="plant-1",
+            unit_id=unit_id,
+            count=2,
+            times=_SPEC,
+            mw_base=10.0,
+            mw_step=0.25,
+        )
+    )
+
+    recs = _parse_lines(lines)
+
+    assert [list(r) for r in recs] == [keys] * 2
+    assert [r["mw"] for r in recs] == [10.0, 10.25]
+    assert all(r.get("unit_id") == unit_id for r in recs)
+
+
+@pytest.mark.parametrize("raw_id", ['m"1', "m\\1", "zähler-1", "m\n1"])
+def test_lines_escape_ids(raw_id: str) -> None:
+    meter = list(
+        produce_ndjson.meter_usage_lines(
+            meter_id=raw_id, premise_id=raw_id, count=1, times=_SPEC, kwh_base=1.0, kwh_step=0.0
+        )
+    )
+    generation = list(
+        produce_ndjson.generation_output_lines(
+            plant_id=raw_id, unit_id=raw_id, count=1, times=_SPEC, mw_base=1.0, mw_step=0.0
+        )
+    )
+
+    [mu] = _parse_lines(meter)
+    [go] = _parse_lines(generation)
+    assert (mu["meter_id"], mu["premise_id"]) == (raw_id, raw_id)
+    assert (go["plant_id"], go["unit_id"]) == (raw_id, raw_id)
+
+
+@pytest.mark.parametrize(
+    ("base", "expected"),
+    [("inf", b'"kwh":Infinity}'), ("-inf", b'"kwh":-Infinity}'), ("nan", b'"kwh":NaN}')],
+)
+def test_meter_usage_lines_spell_non_finite_like_json_dumps(base: str, expected: bytes) -> None:
+    [line] = produce_ndjson.meter_usage_lines(
+        meter_id="m-1", premise_id=None, count=1, times=_SPEC, kwh_base=float(base), kwh_step=0.0
+    )
+
+    assert line.endswith(expected + b"\n")
+
+
+@pytest.mark.parametrize(
+    ("base", "step", "count", "expected"),
+    [
+        pytest.param(1.0, 0.1, 3, ["1.000000", "1.100000", "1.200000"], id="non-zero-step"),
+        pytest.param(2.5, 0.0, 3, ["2.500000"] * 3, id="zero-step"),
+        pytest.param(1.0, 1.0, 0, [], id="empty"),
+        pytest.param(float("nan"), 0.0, 2, ["NaN"] * 2, id="nan-zero-step"),
+        pytest.param(float("nan"), 1.0, 2, ["NaN"] * 2, id="nan-non-zero-step"),
+        pytest.param(float("inf"), 0.0, 2, ["Infinity"] * 2, id="inf"),
+        pytest.param(float("-inf"), 1.0, 2, ["-Infinity"] * 2, id="negative-inf"),
+        pytest.param(0.0, float("inf"), 2, ["NaN", "Infinity"], id="infinite-step"),
+    ],
+)
+def test_series_formats_six_decimals_and_non_finite_like_json_dumps(
+    base: float, step: float, count: int, expected: list[str]
+) -> None:
+    assert list(produce_ndjson._series(base, step, count)) == expected
+
+
+def test_series_overflowing_partway_switches_to_infinity() -> None:
+    values = list(produce_ndjson._series(1e308, 1e308, 3))
+
+    # Finite values print in full at fixed precision rather than as 1e+308.
+    assert values[0] == f"{1e308:.6f}"
+    assert len(values[0].split(".")[0]) == 309
+    assert values[1:] == ["Infinity", "Infinity"]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        pytest.param("2024-01-01T00:00:00Z", _utc(2024, 1, 1), id="plain-z"),
+        pytest.param("2024-01-01Z", _utc(2024, 1, 1), id="bare-date"),
+        pytest.param("2024-01-01T05:00:00+01:00Z", _utc(2024, 1, 1, 5), id="offset-then-z"),
+        pytest.param(
+            "2024-01-01T00:00:00.250Z",
+            _utc(2024, 1, 1) + timedelta(milliseconds=250),
+            id="fractional-seconds",
+        ),
+        pytest.param("20240101T000000Z", _utc(2024, 1, 1), id="basic-format"),
+    ],
+)
+def test_parse_rfc3339_z_accepts_z_suffixed_shapes(text: str, expected: datetime) -> None:
+    parsed = produce_ndjson._parse_rfc3339_z(text)
+
+    assert parsed == expected
+    assert parsed.tzinfo == timezone.utc
+
+
+@pytest.mark.parametrize("text", ["2024-13-01T00:00:00Z", "not-a-timestampZ"])
+def test_parse_rfc3339_z_rejects_invalid_input(text: str) -> None:
+    with pytest.raises(ValueError):
+        produce_ndjson._parse_rfc3339_z(text)
+
+
+@pytest.mark.parametrize("text", ["2024-01-01T00:00:00", "2024-01-01T00:00:00+00:00"])
+def test_parse_rfc3339_z_requires_trailing_z(text: str) -> None:
+    with pytest.raises(ValueError, match="must end with 'Z'"):
+        produce_ndjson._parse_rfc3339_z(text)